@@ -1,11 +1,32 @@
 """XCC Descriptor Parser for determining entity types and capabilities."""
 
+import copy
+import hashlib
 import logging
+from collections import OrderedDict
 from typing import Any
-from xml.etree import ElementTree as ET
+
+from lxml import etree
 
 _LOGGER = logging.getLogger(__name__)
 
+# Shared by every descriptor parse. Descriptors arrive already decoded, so they
+# are re-encoded as UTF-8 and the parser's encoding overrides whatever the XML
+# declaration claims (the controller declares windows-1250).
+_XML_PARSER = etree.XMLParser(
+    encoding="utf-8",
+    remove_blank_text=True,
+    collect_ids=False,
+    resolve_entities=False,
+)
+
+# Parsed descriptor pages keyed by (content digest, page name), LRU-bounded.
+# Only parses that ignore visibility are cached: with visibility evaluated the
+# result also depends on the live data values. A changed page hashes to a new
+# key, so stale entries simply age out.
+_DESCRIPTOR_CACHE: OrderedDict[tuple[bytes, str], dict[str, dict[str, Any]]] = OrderedDict()
+_DESCRIPTOR_CACHE_SIZE = 64
+
 
 class XCCDescriptorParser:
     """Parser for XCC descriptor files to determine entity types and capabilities."""
@@ -56,6 +77,29 @@ class XCCDescriptorParser:
 
     def _parse_single_descriptor(
         self, xml_content: str, page_name: str,
+    ) -> dict[str, dict[str, Any]]:
+        """Parse a single descriptor XML file, reusing an earlier parse of the same content."""
+        if not self.ignore_visibility:
+            return self._parse_descriptor_content(xml_content, page_name)
+
+        digest = hashlib.blake2b(xml_content.encode("utf-8"), digest_size=16).digest()
+        key = (digest, page_name)
+        cached = _DESCRIPTOR_CACHE.get(key)
+        if cached is None:
+            cached = self._parse_descriptor_content(xml_content, page_name)
+            _DESCRIPTOR_CACHE[key] = cached
+            if len(_DESCRIPTOR_CACHE) > _DESCRIPTOR_CACHE_SIZE:
+                _DESCRIPTOR_CACHE.popitem(last=False)
+        else:
+            _DESCRIPTOR_CACHE.move_to_end(key)
+            _LOGGER.debug("Reusing parsed descriptor %s (content unchanged)", page_name)
+
+        # Callers post-process the configs in place (duplicate friendly names),
+        # so never hand out the cached dicts themselves
+        return copy.deepcopy(cached)
+
+    def _parse_descriptor_content(
+        self, xml_content: str, page_name: str,
     ) -> dict[str, dict[str, Any]]:
         """Parse a single descriptor XML file."""
         # Check if this is an HTML-based descriptor (like FVEINV.XML)
@@ -63,10 +107,8 @@ class XCCDescriptorParser:
             return self._parse_html_descriptor(xml_content, page_name)
 
         try:
-            root = ET.fromstring(xml_content)
-            # Store root for parent row lookup
-            self._current_root = root
-        except ET.ParseError as err:
+            root = etree.fromstring(xml_content.encode("utf-8"), _XML_PARSER)
+        except etree.XMLSyntaxError as err:
             _LOGGER.error("Failed to parse XML for %s: %s", page_name, err)
             return {}
 
@@ -112,7 +154,7 @@ class XCCDescriptorParser:
         return entity_configs
 
     def _extract_sensor_info_from_row(
-        self, row: ET.Element, element: ET.Element, page_name: str,
+        self, row: etree._Element, element: etree._Element, page_name: str,
     ) -> dict[str, Any] | None:
         """Extract sensor information from row context for readonly sensors."""
         prop = element.get("prop")
@@ -217,7 +259,7 @@ class XCCDescriptorParser:
         return unit_to_device_class.get(unit)
 
     def _infer_unit_from_context(
-        self, prop: str, row: ET.Element, element: ET.Element,
+        self, prop: str, row: etree._Element, element: etree._Element,
     ) -> str:
         """Infer unit from context when not explicitly specified."""
         # Check row context first for temperature-related text
@@ -308,7 +350,7 @@ class XCCDescriptorParser:
         return ""
 
     def _determine_entity_config(
-        self, element: ET.Element, page_name: str,
+        self, element: etree._Element, page_name: str,
     ) -> dict[str, Any] | None:
         """Determine the entity configuration from an XML element."""
         prop = element.get("prop")
@@ -786,22 +828,11 @@ class XCCDescriptorParser:
 
         return entity_configs
 
-    def _find_parent_row(self, element: ET.Element) -> ET.Element | None:
+    def _find_parent_row(self, element: etree._Element) -> etree._Element | None:
         """Find the parent row element for context."""
-        # Since ElementTree doesn't have getparent(), we need to search differently
-        # We'll store the element reference and search for it in the tree
-        if not hasattr(self, "_current_root"):
-            return None
-
-        # Find the element in the tree and get its parent row
-        immediate_parent = None
-        for row in self._current_root.iter("row"):
-            for child in row.iter():
-                if child is element:
-                    immediate_parent = row
-                    break
-            if immediate_parent is not None:
-                break
+        # The outermost enclosing row, i.e. the first one in document order
+        rows = list(element.iterancestors("row"))
+        immediate_parent = rows[-1] if rows else None
 
         # If the immediate parent has no text, look for the previous row with text
         if immediate_parent is not None:
@@ -809,8 +840,9 @@ class XCCDescriptorParser:
             row_text_en = immediate_parent.get("text_en", "")
 
             if not row_text and not row_text_en:
-                # Look for the previous row with text in the same block
-                for block in self._current_root.iter("block"):
+                # Look for the previous row with text in the same block,
+                # outermost block first
+                for block in reversed(list(immediate_parent.iterancestors("block"))):
                     rows = list(block.iter("row"))
                     for i, row in enumerate(rows):
                         if row is immediate_parent and i > 0:
@@ -825,19 +857,12 @@ class XCCDescriptorParser:
 
         return immediate_parent
 
-    def _find_immediate_parent_row(self, element: ET.Element) -> ET.Element | None:
+    def _find_immediate_parent_row(self, element: etree._Element) -> etree._Element | None:
         """Find the immediate parent row element (without looking for text context)."""
-        if not hasattr(self, "_current_root"):
-            return None
+        rows = list(element.iterancestors("row"))
+        return rows[-1] if rows else None
 
-        # Find the element in the tree and get its immediate parent row
-        for row in self._current_root.iter("row"):
-            for child in row.iter():
-                if child is element:
-                    return row
-        return None
-
-    def _find_label_for_element(self, element: ET.Element, context_row: ET.Element) -> tuple[str, str]:
+    def _find_label_for_element(self, element: etree._Element, context_row: etree._Element) -> tuple[str, str]:
         """Find the corresponding label for an element.
 
         The element might be in a different row than the labels, so we need to find
@@ -848,23 +873,9 @@ class XCCDescriptorParser:
         if context_row is None:
             return "", ""
 
-        # Find the block containing both the context row and the element
-        element_block = None
-        context_block = None
-
-        if hasattr(self, "_current_root"):
-            for block in self._current_root.iter("block"):
-                # Check if this block contains the context row
-                for row in block.iter("row"):
-                    if row is context_row:
-                        context_block = block
-                        break
-
-                # Check if this block contains the element
-                for elem in block.iter():
-                    if elem is element:
-                        element_block = block
-                        break
+        # Find the innermost block containing the context row and the element
+        context_block = next(context_row.iterancestors("block"), None)
+        element_block = next(element.iterancestors("block"), None)
 
         # If they're not in the same block, can't match labels
         if element_block != context_block or element_block is None:
@@ -883,8 +894,8 @@ class XCCDescriptorParser:
         # Get all input elements in the entire block (across all rows)
         input_elements = []
         for row in element_block.iter("row"):
-            for child in row.iter():
-                if child.tag in ["number", "switch", "select", "button"] and child.get("prop"):
+            for child in row.iter("number", "switch", "select", "button"):
+                if child.get("prop"):
                     input_elements.append(child)
 
         # Find the index of our element
@@ -910,7 +921,7 @@ class XCCDescriptorParser:
         return "", ""
 
     def _get_float_attr(
-        self, element: ET.Element, attr: str, default: float | None = None,
+        self, element: etree._Element, attr: str, default: float | None = None,
     ) -> float | None:
         """Get a float attribute from an element."""
         value = element.get(attr)
@@ -922,7 +933,7 @@ class XCCDescriptorParser:
             return default
 
     def _get_int_attr(
-        self, element: ET.Element, attr: str, default: int | None = None,
+        self, element: etree._Element, attr: str, default: int | None = None,
     ) -> int | None:
         """Get an integer attribute from an element."""
         value = element.get(attr)
@@ -933,7 +944,7 @@ class XCCDescriptorParser:
         except ValueError:
             return default
 
-    def _get_choice_options(self, choice_element: ET.Element) -> list[dict[str, str]]:
+    def _get_choice_options(self, choice_element: etree._Element) -> list[dict[str, str]]:
         """Get options for a choice element."""
         options = []
         for option in choice_element.findall("option"):
@@ -995,7 +1006,7 @@ class XCCDescriptorParser:
 
         return True
 
-    def _is_element_visible(self, element: ET.Element) -> bool:
+    def _is_element_visible(self, element: etree._Element) -> bool:
         """Check if an element should be visible based on its visData attribute."""
         vis_data = element.get("visData")
         if not vis_data:
@@ -12,6 +12,7 @@ environment.
 
 from __future__ import annotations
 
+import functools
 import re
 from typing import Any
 
@@ -23,6 +24,11 @@ _NORMALIZE_PREFIX_STRIPS: tuple[str, ...] = ("WEB-", "MAIN-", "CONFIG-")
 _INVALID_ENTITY_ID_CHARS = re.compile(r"[^a-z0-9_]")
 _REPEATED_UNDERSCORES = re.compile(r"_+")
 
+# Data-page suffix dropped to get the device key: "FVE4.XML" -> "FVE",
+# "OKRUH10.XML" -> "OKRUH", "TUV11.XML" -> "TUV1". Only the last "1" of "11"
+# is stripped, so TUV1/TUV2 stay distinct devices.
+_PAGE_SUFFIX_RE = re.compile(r"(?:1|10|4)?\.XML$")
+
 
 def format_entity_id_suffix(prop: str) -> str:
     """Format an XCC property name into a valid Home Assistant entity-ID suffix.
@@ -45,6 +51,7 @@ def format_entity_id_suffix(prop: str) -> str:
     return entity_id or "unknown"
 
 
+@functools.lru_cache(maxsize=4096)
 def normalize_property_name(prop: str) -> str:
     """Normalize an XCC property name for cross-page lookup.
 
@@ -53,6 +60,9 @@ def normalize_property_name(prop: str) -> str:
     prefixes (``WEB-``, ``MAIN-``, ``CONFIG-``). This helper produces a
     canonical form so the coordinator can match a data-page prop against a
     descriptor prop even when those cosmetics differ.
+
+    Memoized: ``lookup_with_normalized_fallback`` normalizes every table key
+    on each miss, and the set of props a controller exposes is small and fixed.
     """
     normalized = prop.upper().replace("_", "-").replace(".", "-")
     for prefix in _NORMALIZE_PREFIX_STRIPS:
@@ -195,14 +205,7 @@ def _normalize_page_to_device(page: str, prop: str) -> str:
         # group them under the existing FVE device. A bare "FVESOC" key is not in
         # _DEVICE_PRIORITY and its entities would otherwise be silently dropped.
         return "FVE"
-    return (
-        page_upper
-        .replace("1.XML", "")
-        .replace("10.XML", "")
-        .replace("11.XML", "")
-        .replace("4.XML", "")
-        .replace(".XML", "")
-    )
+    return _PAGE_SUFFIX_RE.sub("", page_upper)
 
 
 def process_entities(
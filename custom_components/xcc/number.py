@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import sys
 from typing import Any
 
 from homeassistant.components.number import (
@@ -19,6 +20,9 @@ from .coordinator import XCCDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# Full float range, used when the descriptor gives no min/max for a number
+_FLOAT_MAX = sys.float_info.max
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -129,14 +133,12 @@ class XCCNumber(CoordinatorEntity[XCCDataUpdateCoordinator], NumberEntity):
         # Set number properties from descriptor with safe defaults
         # Handle None values from descriptor parser when XML doesn't specify min/max
         # Use Python's float limits for unlimited ranges
-        import sys
-
         min_val = self._entity_config.get("min")
         max_val = self._entity_config.get("max")
 
         # Use full float range when limits are not specified
-        self._attr_native_min_value = min_val if min_val is not None else -sys.float_info.max
-        self._attr_native_max_value = max_val if max_val is not None else sys.float_info.max
+        self._attr_native_min_value = min_val if min_val is not None else -_FLOAT_MAX
+        self._attr_native_max_value = max_val if max_val is not None else _FLOAT_MAX
         self._attr_native_step = self._entity_config.get("step", 1.0)
 
         # Log when using unlimited range for debugging
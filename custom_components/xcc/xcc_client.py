@@ -4,9 +4,12 @@ Reusable authentication and data fetching for CLI, pyscript, and HA integration.
 """
 
 import asyncio
+import functools
 import hashlib
+import io
 import json
 import os
+import re
 
 import aiohttp
 from lxml import etree
@@ -21,10 +24,49 @@ except ImportError:
 # Global lock to prevent concurrent authentication attempts to the same IP
 _auth_locks = {}
 
+# Page URL keyword -> page type, scanned in one regex pass by
+# XCCClient._determine_page_type. The leftmost match in the URL decides, so
+# 'bivtuv.xml' is bivalent ('biv' at offset 0 beats 'tuv'). For a full URL a
+# keyword in the hostname wins over the page path.
+_PAGE_TYPES = {
+    'status.xml': 'status',  # Matches both STATUS.XML (data) and stavjed.xml (descriptor)
+    'stavjed.xml': 'status',
+    'okruh.xml': 'heating_circuit',
+    'mzona.xml': 'mixed_zone',
+    'biv': 'bivalent',
+    'tuv': 'hot_water',
+    'bazen': 'pool',
+    'bazmist': 'pool',
+    'fve.xml': 'photovoltaics',
+    'fveinv.xml': 'pv_inverter',
+    'vzt.xml': 'ventilation',
+    'solar.xml': 'solar',
+    'meteo.xml': 'weather_station',
+    'pocasi.xml': 'weather_forecast',
+    'elmer.xml': 'electricity_meter',
+    'spot.xml': 'spot_pricing',
+}
+_PAGE_TYPE_RE = re.compile("(" + "|".join(map(re.escape, _PAGE_TYPES)) + ")")
+
+# XML declarations and processing instructions (e.g. xml-stylesheet) in main.xml
+_XML_DECL_RE = re.compile(r"<\?xml[^>]*\?>")
+
+# Shared parser for data pages, which arrive as already-decoded text
+_DATA_XML_PARSER = etree.XMLParser(encoding="utf-8", remove_blank_text=True)
+
 
 class XCCClient:
     """Client for XCC heat pump controller communication."""
 
+    # XPath expressions evaluated once per <F> page definition in main.xml,
+    # compiled once instead of re-parsing the expression for every element
+    _XPATH_PAGE_NAME = etree.XPath('.//INPUTN[@NAME and @VALUE]')
+    _XPATH_ACTIVE_V = etree.XPath('.//INPUTV[@VALUE="1"]')
+    _XPATH_ACTIVE_I = etree.XPath('.//INPUTI[@VALUE and @VALUE!="0"]')
+    _XPATH_CONFIG_I = etree.XPath('.//INPUTI[@VALUE]')
+    _XPATH_NAME_VALUE = etree.XPath(".//INPUTN[@VALUE]")
+    _XPATH_VISIBILITY = etree.XPath(".//INPUTV[@NAME and @VALUE]")
+
     def __init__(
         self,
         ip: str,
@@ -192,18 +234,21 @@ class XCCClient:
             # Parse XML to find active pages
             pages_info = {}
 
-            # Remove XML declaration and parse
-            import re
-            xml_clean = re.sub(r'<\?xml[^>]*\?>', '', main_content).strip()
-
-            # Wrap in root element if needed
-            if not xml_clean.startswith('<PAGE>'):
-                xml_clean = f'<PAGE>{xml_clean}</PAGE>'
-
-            root = etree.fromstring(xml_clean)
-
-            # Find all F elements (page definitions)
-            for f_elem in root.xpath('.//F'):
+            # Remove XML declaration and wrap in root element if needed, so
+            # content with several top-level elements still parses
+            xml_clean = _XML_DECL_RE.sub("", main_content).strip()
+            if not xml_clean.startswith("<PAGE>"):
+                xml_clean = f"<PAGE>{xml_clean}</PAGE>"
+
+            # Stream the F elements (page definitions) instead of building the
+            # whole tree. The content is already decoded, so it is fed back as
+            # UTF-8. Malformed XML raises and is reported below.
+            context = etree.iterparse(
+                io.BytesIO(xml_clean.encode("utf-8")),
+                tag="F",
+                encoding="utf-8",
+            )
+            for _, f_elem in context:
                 try:
                     page_id = f_elem.get('N')
                     page_url = f_elem.get('U')
@@ -213,20 +258,20 @@ class XCCClient:
                         continue
 
                     # Extract page name from INPUTN elements
-                    name_elem = f_elem.xpath('.//INPUTN[@NAME and @VALUE]')
+                    name_elem = self._XPATH_PAGE_NAME(f_elem)
                     page_name = name_elem[0].get('VALUE') if name_elem else f"Page {page_id}"
 
                     # Check if page is active using multiple criteria
                     is_active = False
 
                     # Method 1: INPUTV with VALUE="1" (most common for user-configurable pages)
-                    active_elem_v = f_elem.xpath('.//INPUTV[@VALUE="1"]')
+                    active_elem_v = self._XPATH_ACTIVE_V(f_elem)
                     if len(active_elem_v) > 0:
                         is_active = True
 
                     # Method 2: INPUTI with non-zero VALUE (for system pages like biv.xml)
                     if not is_active:
-                        active_elem_i = f_elem.xpath('.//INPUTI[@VALUE and @VALUE!="0"]')
+                        active_elem_i = self._XPATH_ACTIVE_I(f_elem)
                         if len(active_elem_i) > 0:
                             # Additional check: some pages have meaningful non-zero values
                             for elem in active_elem_i:
@@ -242,7 +287,7 @@ class XCCClient:
                     # Method 3: Special handling for essential system pages
                     if not is_active and page_url in ['biv.xml', 'bivtuv.xml', 'stavjed.xml']:
                         # These pages are considered active if they have any configuration data
-                        config_elem = f_elem.xpath('.//INPUTI[@VALUE]')
+                        config_elem = self._XPATH_CONFIG_I(f_elem)
                         if len(config_elem) > 0:
                             is_active = True
 
@@ -265,6 +310,11 @@ class XCCClient:
                 except Exception as e:
                     _LOGGER.warning("Error parsing page element: %s", e)
                     continue
+                finally:
+                    # Drop the processed page and its earlier siblings
+                    f_elem.clear()
+                    while f_elem.getprevious() is not None:
+                        del f_elem.getparent()[0]
 
             _LOGGER.info(
                 "Discovered %d pages, %d active",
@@ -303,11 +353,11 @@ class XCCClient:
                 page_url = f_elem.get("U", "")
 
                 # Get page name from INPUTN for friendly naming
-                name_elems = f_elem.xpath(".//INPUTN[@VALUE]")
+                name_elems = self._XPATH_NAME_VALUE(f_elem)
                 page_name = name_elems[0].get("VALUE") if name_elems else f"Page {page_id}"
 
                 # INPUTV: feature visibility switch
-                for v_elem in f_elem.xpath(".//INPUTV[@NAME and @VALUE]"):
+                for v_elem in self._XPATH_VISIBILITY(f_elem):
                     name_attr = v_elem.get("NAME", "")
                     value = v_elem.get("VALUE", "0")
                     prop = f"SYSCONFIG-PAGE{page_id}-VISIBLE"
@@ -374,51 +424,22 @@ class XCCClient:
 
         return entities
 
-    def _determine_page_type(self, page_url: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _determine_page_type(page_url: str) -> str:
         """Determine the type of page based on its URL.
 
+        Pure function of the URL, and the controller only serves a handful of
+        pages, so results are memoized.
+
         Args:
             page_url: The page URL (e.g., 'okruh.xml?page=0')
 
         Returns:
             Page type string
         """
-        url_lower = page_url.lower()
-
-        if 'status.xml' in url_lower:
-            return 'status'  # Matches both STATUS.XML (data) and stavjed.xml (descriptor)
-        elif 'stavjed.xml' in url_lower:
-            return 'status'
-        elif 'okruh.xml' in url_lower:
-            return 'heating_circuit'
-        elif 'mzona.xml' in url_lower:
-            return 'mixed_zone'
-        elif 'bivtuv.xml' in url_lower:  # Check specific bivalent hot water first
-            return 'bivalent'
-        elif 'biv' in url_lower:  # Then general bivalent
-            return 'bivalent'
-        elif 'tuv' in url_lower:  # Then general hot water
-            return 'hot_water'
-        elif 'bazen' in url_lower or 'bazmist' in url_lower:
-            return 'pool'
-        elif 'fve.xml' in url_lower:
-            return 'photovoltaics'
-        elif 'fveinv.xml' in url_lower:
-            return 'pv_inverter'
-        elif 'vzt.xml' in url_lower:
-            return 'ventilation'
-        elif 'solar.xml' in url_lower:
-            return 'solar'
-        elif 'meteo.xml' in url_lower:
-            return 'weather_station'
-        elif 'pocasi.xml' in url_lower:
-            return 'weather_forecast'
-        elif 'elmer.xml' in url_lower:
-            return 'electricity_meter'
-        elif 'spot.xml' in url_lower:
-            return 'spot_pricing'
-        else:
-            return 'other'
+        match = _PAGE_TYPE_RE.search(page_url.lower())
+        return _PAGE_TYPES[match.group(1)] if match else 'other'
 
     async def discover_data_pages(self, descriptor_pages: list[str]) -> dict[str, list[str]]:
         """Discover data pages by examining descriptor pages for references.
@@ -441,6 +462,17 @@ class XCCClient:
 
         data_pages_map = {}
 
+        # The controller allows a single connection, so pages are fetched one
+        # at a time; reuse each successfully fetched candidate data page
+        # instead of fetching it again for validation or for every descriptor
+        # that references it. Failures are not cached, so they are retried.
+        fetched = {}
+
+        async def fetch_candidate(page: str) -> str:
+            if page not in fetched:
+                fetched[page] = await self.fetch_page(page)
+            return fetched[page]
+
         for desc_page in descriptor_pages:
             try:
                 _LOGGER.debug("Examining descriptor page %s for data page references", desc_page)
@@ -470,7 +502,7 @@ class XCCClient:
                     if pattern not in data_pages:
                         # Test if this page exists by trying to fetch it
                         try:
-                            test_content = await self.fetch_page(pattern)
+                            test_content = await fetch_candidate(pattern)
                             if not self._is_login_page(test_content) and len(test_content) > 100:
                                 data_pages.append(pattern)
                                 _LOGGER.debug("Found data page %s for descriptor %s", pattern, desc_page)
@@ -485,7 +517,7 @@ class XCCClient:
                 for page in unique_pages:
                     try:
                         # Quick validation - try to fetch the page
-                        test_content = await self.fetch_page(page)
+                        test_content = await fetch_candidate(page)
                         if not self._is_login_page(test_content) and len(test_content) > 50:
                             valid_pages.append(page)
                             _LOGGER.debug("Validated data page %s", page)
@@ -965,13 +997,10 @@ def parse_xml_entities(
     )
 
     try:
-        # xml_content is already a properly decoded string from fetch_page()
-        # Remove XML declaration if present to avoid encoding issues with etree.fromstring()
-        import re
-        xml_clean = re.sub(r'<\?xml[^>]*\?>', '', xml_content).strip()
-
+        # xml_content is already a properly decoded string from fetch_page();
+        # the parser's encoding overrides whatever the XML declaration claims
         try:
-            root = etree.fromstring(xml_clean)
+            root = etree.fromstring(xml_content.strip().encode("utf-8"), _DATA_XML_PARSER)
             _LOGGER.debug("Successfully parsed XML content for %s", page_name)
         except Exception as e:
             _LOGGER.warning(
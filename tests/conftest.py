@@ -18,8 +18,11 @@ individual test files.
 
 from __future__ import annotations
 
+import codecs
 import os
+import re
 import sys
+from types import SimpleNamespace
 
 # Pre-cache the stdlib ``select`` and ``selectors`` modules in ``sys.modules``
 # before any test file gets a chance to prepend ``custom_components/xcc`` to
@@ -47,6 +50,43 @@ for _p in (_REPO_ROOT, _CC_DIR):
 sys.path[:] = [p for p in sys.path if os.path.normcase(os.path.abspath(p)) != os.path.normcase(_XCC_DIR)]
 
 
+# Encoding named in an XML declaration
+_XML_ENCODING_RE = re.compile(rb"""encoding=["']([^"']+)""")
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _detect_encoding(head: bytes) -> str:
+    """Pick the codec for an XML file from its first bytes.
+
+    A BOM wins, then the XML declaration; XCC controllers otherwise serve
+    windows-1250.
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    match = _XML_ENCODING_RE.search(head[:200])
+    if match:
+        encoding = match.group(1).decode("ascii", errors="ignore")
+        try:
+            return codecs.lookup(encoding).name
+        except LookupError:
+            pass
+    return "windows-1250"
+
+
+def _load_xml_file(file_path) -> str:
+    """Load an XML file in the encoding it declares."""
+    with open(file_path, "rb") as f:
+        raw_content = f.read()
+    return raw_content.decode(_detect_encoding(raw_content[:256]), errors="replace")
+
+
+
 @pytest.fixture
 def sample_data_dir():
     """Return the path to the sample data directory."""
@@ -57,3 +97,44 @@ def sample_data_dir():
 def repo_root():
     """Return the repository root directory."""
     return _REPO_ROOT
+
+
+@pytest.fixture(scope="session")
+def sample_main_xml():
+    """Return the sample ``main.xml`` text, read once per session."""
+    with open(os.path.join(os.path.dirname(__file__), "sample_data", "main.xml"), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="session")
+def load_xml_file():
+    """Return the sample XML loader: BOM, then XML declaration, else windows-1250."""
+    return _load_xml_file
+
+
+@pytest.fixture(scope="session")
+def xcc_sources():
+    """Return the integration's ``.py`` sources keyed by file name, read once per session."""
+    sources = {}
+    for name in os.listdir(_XCC_DIR):
+        if name.endswith(".py"):
+            with open(os.path.join(_XCC_DIR, name), encoding="utf-8") as f:
+                sources[name] = f.read()
+    return sources
+
+
+@pytest.fixture(scope="session")
+def xcc_modules():
+    """Return the integration modules used by the tests, imported once per session.
+
+    Uses package imports per the path rules above, so Home Assistant must be
+    installed; tests using this fixture are skipped otherwise.
+    """
+    pytest.importorskip("homeassistant")
+    from custom_components.xcc import coordinator, descriptor_parser, xcc_client
+
+    return SimpleNamespace(
+        coordinator=coordinator,
+        descriptor_parser=descriptor_parser,
+        xcc_client=xcc_client,
+    )
@@ -24,6 +24,7 @@ no-Home-Assistant unit job.
 
 from __future__ import annotations
 
+import functools
 import importlib.util
 import logging
 import os
@@ -69,12 +70,18 @@ _DEVICE_PRIORITY = _entity_helpers._DEVICE_PRIORITY
 parse_xml_entities = _xcc_client.parse_xml_entities
 
 
-def _read_sample(name: str, encoding: str) -> str:
-    path = os.path.join(_SAMPLE_DIR, name)
-    if not os.path.exists(path):
+@functools.cache
+def _read_sample_bytes(name: str) -> bytes:
+    # Fixtures are read-only for the session; several tests share each file.
+    try:
+        with open(os.path.join(_SAMPLE_DIR, name), "rb") as fh:
+            return fh.read()
+    except FileNotFoundError:
         pytest.skip(f"sample file {name} not found")
-    with open(path, "rb") as fh:
-        return fh.read().decode(encoding)
+
+
+def _read_sample(name: str, encoding: str) -> str:
+    return _read_sample_bytes(name).decode(encoding)
 
 
 def _parse_descriptor() -> dict:
@@ -104,13 +111,26 @@ def test_every_nast_page_routes_to_nast_device(page):
 
 def test_nast2_data_sample_carries_omezeni_value():
     """The committed NAST2.XML fixture holds the live INPUT value; the
-    descriptor (nast.xml / NAST.XML echo) only declares the prop, no value."""
-    data = _read_sample("NAST2.XML", "windows-1250")
-    assert 'P="OMEZENIVYKONUGLOBALNI"' in data, "value missing from NAST2.XML sample"
-    descriptor = _read_sample(_DESCRIPTOR, "utf-8")
+    descriptor (nast.xml / NAST.XML echo) only declares the prop, no value.
+
+    The markers are pure ASCII, so they are matched on the raw bytes of both
+    files -- no windows-1250 / UTF-8 decode needed.
+    """
+    data = _read_sample_bytes("NAST2.XML")
+    assert b'P="OMEZENIVYKONUGLOBALNI"' in data, "value missing from NAST2.XML sample"
+    descriptor = _read_sample_bytes(_DESCRIPTOR)
     # Descriptor uses prop="…" (declaration), never P="…" (a live value).
-    assert 'P="OMEZENIVYKONUGLOBALNI"' not in descriptor
-    assert 'prop="OMEZENIVYKONUGLOBALNI"' in descriptor
+    assert b'P="OMEZENIVYKONUGLOBALNI"' not in descriptor
+    assert b'prop="OMEZENIVYKONUGLOBALNI"' in descriptor
+
+
+@pytest.mark.parametrize("page", _DATA_PAGES)
+def test_each_nast_data_page_carries_values(page):
+    """Each NASTn.XML fixture must parse to live INPUT values on its own, so a
+    missing or empty data page is reported by name rather than surfacing as a
+    low entity count in the end-to-end test below."""
+    entities = parse_xml_entities(_read_sample(page, "windows-1250"), page)
+    assert entities, f"{page} yielded no INPUT values"
 
 
 def test_full_pipeline_populates_omezeni_on_nast_device():
@@ -4,90 +4,79 @@ This test verifies that number entities handle None min/max values correctly
 to prevent TypeError when Home Assistant tries to validate values.
 """
 
-import pytest
-from unittest.mock import Mock
 import sys
-import os
 
-# Add the custom_components directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'custom_components', 'xcc'))
+import pytest
 
-def test_number_entity_handles_none_min_max():
+# Bound once, mirroring number.py, so the helpers don't walk sys.float_info per call
+_FLOAT_MAX = sys.float_info.max
+
+def simulate_min_max_handling(entity_config):
+    """Simulate the min/max handling logic from XCCNumber.__init__
+
+    Tests the logic without importing Home Assistant components.
+    """
+    min_val = entity_config.get("min")
+    max_val = entity_config.get("max")
+
+    # Use full float range when limits are not specified
+    native_min_value = min_val if min_val is not None else -_FLOAT_MAX
+    native_max_value = max_val if max_val is not None else _FLOAT_MAX
+    native_step = entity_config.get("step", 1.0)
+
+    return native_min_value, native_max_value, native_step
+
+
+MIN_MAX_CASES = [
+    pytest.param(
+        {
+            'entity_id': 'number.xcc_test_entity',
+            'prop': 'TEST_PROP',
+            'min': None,  # This would cause TypeError in Home Assistant
+            'max': None,  # This would cause TypeError in Home Assistant
+            'step': 1.0,
+            'unit': '°C',
+            'friendly_name': 'Test Entity'
+        },
+        -sys.float_info.max, sys.float_info.max, 1.0,
+        id="none_min_max_unlimited",
+    ),
+    pytest.param(
+        {
+            'entity_id': 'number.xcc_test_entity2',
+            'prop': 'TEST_PROP2',
+            'min': 10.0,
+            'max': 90.0,
+            'step': 0.5,
+            'unit': '°C',
+            'friendly_name': 'Test Entity 2'
+        },
+        10.0, 90.0, 0.5,
+        id="valid_min_max_preserved",
+    ),
+    pytest.param(
+        {
+            'entity_id': 'number.xcc_test_entity3',
+            'prop': 'TEST_PROP3',
+            # min and max keys are missing entirely
+            'step': 2.0,
+            'unit': 'W',
+            'friendly_name': 'Test Entity 3'
+        },
+        -sys.float_info.max, sys.float_info.max, 2.0,
+        id="missing_min_max_unlimited",
+    ),
+]
+
+
+@pytest.mark.parametrize("entity_config,exp_min,exp_max,exp_step", MIN_MAX_CASES)
+def test_number_entity_handles_none_min_max(entity_config, exp_min, exp_max, exp_step):
     """Test that number entities handle None min/max values correctly."""
+    min_val, max_val, step_val = simulate_min_max_handling(entity_config)
 
-    # Test the logic without importing Home Assistant components
-    # This simulates the min/max handling logic from the number entity
-
-    def simulate_min_max_handling(entity_config):
-        """Simulate the min/max handling logic from XCCNumber.__init__"""
-        import sys
-
-        min_val = entity_config.get("min")
-        max_val = entity_config.get("max")
-
-        # Use full float range when limits are not specified
-        native_min_value = min_val if min_val is not None else -sys.float_info.max
-        native_max_value = max_val if max_val is not None else sys.float_info.max
-        native_step = entity_config.get("step", 1.0)
-
-        return native_min_value, native_max_value, native_step
-
-    # Test case 1: Entity config with None min/max values
-    entity_config_none = {
-        'entity_id': 'number.xcc_test_entity',
-        'prop': 'TEST_PROP',
-        'min': None,  # This would cause TypeError in Home Assistant
-        'max': None,  # This would cause TypeError in Home Assistant
-        'step': 1.0,
-        'unit': '°C',
-        'friendly_name': 'Test Entity'
-    }
-
-    min_val, max_val, step_val = simulate_min_max_handling(entity_config_none)
-
-    # Verify that None values are converted to unlimited range
-    import sys
-    assert min_val == -sys.float_info.max, "None min should default to -sys.float_info.max"
-    assert max_val == sys.float_info.max, "None max should default to sys.float_info.max"
-    assert step_val == 1.0, "Step should be preserved"
-    
-    # Test case 2: Entity config with valid min/max values
-    entity_config_valid = {
-        'entity_id': 'number.xcc_test_entity2',
-        'prop': 'TEST_PROP2',
-        'min': 10.0,
-        'max': 90.0,
-        'step': 0.5,
-        'unit': '°C',
-        'friendly_name': 'Test Entity 2'
-    }
-
-    min_val2, max_val2, step_val2 = simulate_min_max_handling(entity_config_valid)
-
-    # Verify that valid values are preserved
-    assert min_val2 == 10.0, "Valid min should be preserved"
-    assert max_val2 == 90.0, "Valid max should be preserved"
-    assert step_val2 == 0.5, "Valid step should be preserved"
-    
-    # Test case 3: Entity config with missing min/max keys
-    entity_config_missing = {
-        'entity_id': 'number.xcc_test_entity3',
-        'prop': 'TEST_PROP3',
-        # min and max keys are missing entirely
-        'step': 2.0,
-        'unit': 'W',
-        'friendly_name': 'Test Entity 3'
-    }
-
-    min_val3, max_val3, step_val3 = simulate_min_max_handling(entity_config_missing)
-
-    # Verify that missing keys default to unlimited range
-    import sys
-    assert min_val3 == -sys.float_info.max, "Missing min should default to -sys.float_info.max"
-    assert max_val3 == sys.float_info.max, "Missing max should default to sys.float_info.max"
-    assert step_val3 == 2.0, "Valid step should be preserved"
-    
-    print("✅ Number entity min/max handling test passed")
+    assert min_val == exp_min, f"min should be {exp_min}, got {min_val}"
+    assert max_val == exp_max, f"max should be {exp_max}, got {max_val}"
+    assert step_val == exp_step, "Step should be preserved"
 
 
 def test_number_entity_value_validation_compatibility():
@@ -95,7 +84,6 @@ def test_number_entity_value_validation_compatibility():
 
     # Test the validation logic without importing Home Assistant components
     # This simulates the Home Assistant validation that was failing
-    import sys
 
     def simulate_validation_logic(entity_config, test_value):
         """Simulate Home Assistant's number validation logic"""
@@ -103,8 +91,8 @@ def test_number_entity_value_validation_compatibility():
         max_val = entity_config.get("max")
 
         # Apply the same logic as our fixed number entity
-        min_value = min_val if min_val is not None else -sys.float_info.max
-        max_value = max_val if max_val is not None else sys.float_info.max
+        min_value = min_val if min_val is not None else -_FLOAT_MAX
+        max_value = max_val if max_val is not None else _FLOAT_MAX
 
         # This is the line that was causing TypeError: '<' not supported between instances of 'float' and 'NoneType'
         # Now it should work because min_value and max_value are always floats
@@ -126,42 +114,29 @@ def test_number_entity_value_validation_compatibility():
 
     # Test all values - this should not raise TypeError anymore
     try:
-        for test_value in test_values:
-            is_valid, min_value, max_value = simulate_validation_logic(entity_config, test_value)
-
-            # Verify the validation logic works
-            assert isinstance(is_valid, bool), f"Validation should return boolean for value {test_value}"
-            assert is_valid == True, f"Value {test_value} should be valid in unlimited range"
-
-            # Verify min/max are proper floats
-            assert isinstance(min_value, float), "min_value should be float"
-            assert isinstance(max_value, float), "max_value should be float"
-            assert min_value < max_value, "min_value should be less than max_value"
+        # The bounds don't depend on the value, so get and check them once
+        _, min_value, max_value = simulate_validation_logic(entity_config, 0.0)
+
+        # Verify min/max are proper floats
+        assert isinstance(min_value, float), "min_value should be float"
+        assert isinstance(max_value, float), "max_value should be float"
+        assert min_value < max_value, "min_value should be less than max_value"
+
+        # Verify the validation logic works
+        invalid = [
+            test_value
+            for test_value in test_values
+            if simulate_validation_logic(entity_config, test_value)[0] is not True
+        ]
+        assert not invalid, f"Values {invalid} should be valid (boolean True) in unlimited range"
 
         # Test edge cases with unlimited range
-        is_valid, min_value, max_value = simulate_validation_logic(entity_config, 0.0)
-        assert min_value <= 0.0 <= max_value, "Zero should be valid in unlimited range"
-
-        print("✅ Number entity value validation compatibility test passed")
+        is_valid, _, _ = simulate_validation_logic(entity_config, 0.0)
+        assert is_valid, "Zero should be valid in unlimited range"
 
     except TypeError as e:
         pytest.fail(f"TypeError should not occur with fixed min/max handling: {e}")
 
 
 if __name__ == "__main__":
-    """Run tests when executed directly."""
-    print("🔧 Testing Number Entity Min/Max Value Handling")
-    print("=" * 50)
-    
-    try:
-        test_number_entity_handles_none_min_max()
-        test_number_entity_value_validation_compatibility()
-        
-        print("\n🎉 ALL NUMBER MIN/MAX TESTS PASSED!")
-        print("✅ None min/max values handled correctly")
-        print("✅ Home Assistant validation compatibility verified")
-        print("✅ TypeError prevention confirmed")
-        
-    except Exception as e:
-        print(f"\n❌ TEST FAILED: {e}")
-        raise
+    pytest.main([__file__, "-v"])
@@ -6,28 +6,125 @@ This test verifies that the number platform correctly sets up
 number entities and handles timeout/error conditions gracefully.
 """
 
+import io
+import itertools
+import logging
+import mmap
 import pytest
-import sys
+import xml.etree.ElementTree as ET
 from pathlib import Path
 import re
 
-# Add project root to path
+_LOGGER = logging.getLogger(__name__)
+
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
 
-def test_number_platform_resilience():
-    """Test that number platform setup is resilient to timeout issues."""
-    
-    print(f"\n=== TESTING NUMBER PLATFORM RESILIENCE ===")
-    
-    # Load the number platform code to check for resilience patterns
-    number_py_file = project_root / "custom_components" / "xcc" / "number.py"
-    
-    if not number_py_file.exists():
-        pytest.skip("number.py not found")
+# Compiled once and matched against raw file bytes. Props are ASCII, but
+# values may not be, so they are decoded with the encoding TUV11.XML declares
+# (windows-1250).
+INPUT_RE = re.compile(rb'<INPUT[^>]*P="([^"]+)"[^>]*VALUE="([^"]*)"')
+
+# Number entities the TUV page is expected to expose, matched in a single descriptor
+# scan: group 1 is the prop, group 2 the tag's config attribute (wherever it
+# sits in the tag), if any.
+EXPECTED_NUMBER_ENTITIES = (
+    "TUVPOZADOVANA", "TUVMINIMALNI", "TUVMAXIMALNIDOBANATAPENI",
+    "TUVDOBAKLIDU", "TO-POZADOVANA", "TO-UTLUMOVA",
+)
+EXPECTED_NUMBER_DESC_RE = re.compile(
+    rb'<number(?=[^>]*prop="('
+    + b"|".join(re.escape(name).encode() for name in EXPECTED_NUMBER_ENTITIES)
+    + rb')")(?:[^>]*config="([^"]*)")?'
+)
+
+# One alternation for the single-shot log markers, dispatched on the named
+# group that matched; the free-form timeout lines are collected separately.
+# Bytes patterns, run straight over an mmap of the log; ``.`` stops at newlines
+# so no match spans lines.
+LOG_RE = re.compile(
+    rb"(?P<not_ready>ConfigEntryNotReady.*number)"
+    rb"|(?P<slow_setup>Setup of number platform xcc is taking over \d+ seconds)"
+    rb"|Final entity distribution:.*'numbers': (?P<coordinator_numbers>\d+)"
+    rb"|Added (?P<added_numbers>\d+) XCC number entities"
+)
+LOG_TIMEOUT_RE = re.compile(rb'(.*timeout.*number.*|.*number.*timeout.*)', re.IGNORECASE)
+LOG_TAIL_BYTES = 16 * 1024 * 1024
+
+SAMPLE_DIR = project_root / "tests" / "sample_data"
+NUMBER_PY_FILE = project_root / "custom_components" / "xcc" / "number.py"
+
+
+def _read_bytes_or_skip(path: Path, what: str) -> bytes:
+    if not path.exists():
+        pytest.skip(f"{what} not found")
+    return path.read_bytes()
+
+
+def _scan_number_log(log_file: Path, start: int = 0):
+    """Scan homeassistant.log from byte offset ``start`` in one pass.
+
+    The file is mmapped and the compiled bytes patterns run over the mapping
+    directly, so the log is never copied into a Python string.
+
+    Returns ``(number_errors, coordinator_numbers, added_numbers)``; the counts
+    are the last occurrence after ``start`` (the most recent startup), or None
+    if absent.
+    """
+    config_not_ready = False
+    slow_setup = False
+    timeout_matches = []
+    coordinator_numbers_count = None
+    added_numbers_count = None
+    if log_file.stat().st_size:  # mmap refuses empty files
+        with open(log_file, 'rb') as raw, mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if start:
+                # Drop the partial line we landed in
+                newline = mm.find(b"\n", start)
+                start = len(mm) if newline == -1 else newline + 1
+            timeout_matches = [
+                m.group(1).decode('utf-8', 'replace').rstrip("\r")
+                for m in LOG_TIMEOUT_RE.finditer(mm, start)
+            ]
+            for match in LOG_RE.finditer(mm, start):
+                kind = match.lastgroup
+                if kind == "not_ready":
+                    config_not_ready = True
+                elif kind == "slow_setup":
+                    slow_setup = True
+                elif kind == "coordinator_numbers":
+                    coordinator_numbers_count = int(match.group(kind))
+                elif kind == "added_numbers":
+                    added_numbers_count = int(match.group(kind))
     
-    with open(number_py_file, 'r', encoding='utf-8') as f:
-        number_code = f.read()
+    number_errors = []
+    if config_not_ready:
+        number_errors.append("ConfigEntryNotReady in number platform")
+    number_errors.extend(timeout_matches)
+    if slow_setup:
+        number_errors.append("Number platform setup taking too long")
+    return number_errors, coordinator_numbers_count, added_numbers_count
+
+
+@pytest.fixture(scope="module")
+def tuv_desc():
+    """Raw bytes of the TUV descriptor, read once per module."""
+    return _read_bytes_or_skip(SAMPLE_DIR / "tuv1.xml", "TUV sample files")
+
+
+@pytest.fixture(scope="module")
+def tuv_data():
+    """Raw bytes of the TUV data page, read once per module."""
+    return _read_bytes_or_skip(SAMPLE_DIR / "TUV11.XML", "TUV sample files")
+
+
+@pytest.fixture(scope="module")
+def number_code():
+    """Source of the number platform, shared by the source-inspection tests."""
+    return _read_bytes_or_skip(NUMBER_PY_FILE, "number.py").decode("utf-8")
+
+
+def test_number_platform_resilience(number_code):
+    """Test that number platform setup is resilient to timeout issues."""
     
     # Check for resilience patterns
     resilience_checks = {
@@ -38,259 +135,152 @@ def test_number_platform_resilience():
         "No ConfigEntryNotReady import": "from homeassistant.exceptions import ConfigEntryNotReady" not in number_code,
     }
     
-    print(f"🔍 RESILIENCE ANALYSIS:")
-    for check, passed in resilience_checks.items():
-        status = "✅ PASS" if passed else "❌ FAIL"
-        print(f"  {check}: {status}")
-    
     # Test assertions
-    all_passed = all(resilience_checks.values())
-    assert all_passed, f"Number platform should be resilient to timeout issues"
-    
-    print(f"✅ Number platform resilience test PASSED!")
+    failed = [check for check, passed in resilience_checks.items() if not passed]
+    assert not failed, f"Number platform should be resilient to timeout issues, failed: {failed}"
 
 
-def test_coordinator_number_data_structure():
+def test_coordinator_number_data_structure(tuv_desc, tuv_data):
     """Test that coordinator provides correct number data structure."""
     
-    print(f"\n=== TESTING COORDINATOR NUMBER DATA STRUCTURE ===")
-    
-    # Load sample data to verify number entity creation
-    sample_dir = project_root / "tests" / "sample_data"
-    
-    # Check TUV data for number entities
-    tuv_desc_file = sample_dir / "tuv1.xml"
-    tuv_data_file = sample_dir / "TUV11.XML"
-    
-    if not tuv_desc_file.exists() or not tuv_data_file.exists():
-        pytest.skip("TUV sample files not found")
-    
-    # Load descriptor to find number entities
-    with open(tuv_desc_file, 'r', encoding='utf-8') as f:
-        desc_content = f.read()
-    
-    # Load data to find values
-    with open(tuv_data_file, 'r', encoding='utf-8') as f:
-        data_content = f.read()
-    
-    # Find number elements in descriptor
-    number_elements = re.findall(r'<number[^>]*prop="([^"]*)"[^>]*>', desc_content)
-    
-    # Find corresponding data values
-    number_entities_with_data = []
-    for prop in number_elements:
-        data_match = re.search(rf'<INPUT[^>]*P="{re.escape(prop)}"[^>]*VALUE="([^"]*)"', data_content)
-        if data_match:
-            value = data_match.group(1)
-            number_entities_with_data.append((prop, value))
-    
-    print(f"📊 NUMBER ENTITY ANALYSIS:")
-    print(f"  Number elements in descriptor: {len(number_elements)}")
-    print(f"  Number entities with data: {len(number_entities_with_data)}")
-    
-    # Show examples
-    print(f"\n🔍 EXAMPLE NUMBER ENTITIES:")
-    for i, (prop, value) in enumerate(number_entities_with_data[:5]):
-        print(f"  {i+1}. {prop} = {value}")
+    # Stream the descriptor through expat, keeping only the number props
+    number_elements = []
+    for _, elem in ET.iterparse(io.BytesIO(tuv_desc), events=("end",)):
+        if elem.tag == "number" and "prop" in elem.attrib:
+            number_elements.append(elem.attrib["prop"])
+        elem.clear()
+    
+    # Index every data value in the same streaming way, then look each number prop up
+    data_values = {}
+    for _, elem in ET.iterparse(io.BytesIO(tuv_data), events=("end",)):
+        if elem.tag == "INPUT" and "P" in elem.attrib and "VALUE" in elem.attrib:
+            data_values[elem.attrib["P"]] = elem.attrib["VALUE"]
+        elem.clear()
+    number_entities_with_data = {
+        prop: data_values[prop] for prop in number_elements if prop in data_values
+    }
     
-    # Check for TUVMINIMALNI specifically
-    tuvminimalni_found = any(prop == "TUVMINIMALNI" for prop, _ in number_entities_with_data)
-    if tuvminimalni_found:
-        tuvminimalni_value = next(value for prop, value in number_entities_with_data if prop == "TUVMINIMALNI")
-        print(f"  ✅ TUVMINIMALNI found: {tuvminimalni_value}")
-    else:
-        print(f"  ❌ TUVMINIMALNI not found in number entities")
+    _LOGGER.debug(
+        "Number elements in descriptor: %d, with data: %d, examples: %s",
+        len(number_elements),
+        len(number_entities_with_data),
+        list(itertools.islice(number_entities_with_data.items(), 5)),
+    )
+    _LOGGER.debug("TUVMINIMALNI value: %s", number_entities_with_data.get("TUVMINIMALNI"))
     
     # Test assertions
     assert len(number_elements) > 10, f"Should find many number elements, found {len(number_elements)}"
     assert len(number_entities_with_data) > 5, f"Should find number entities with data, found {len(number_entities_with_data)}"
-    
-    print(f"✅ Coordinator number data structure test PASSED!")
 
 
 def test_number_platform_error_analysis():
     """Analyze the specific error that caused number platform failure."""
     
-    print(f"\n=== NUMBER PLATFORM ERROR ANALYSIS ===")
-    
     # Load the log file to analyze the error
     log_file = project_root / "homeassistant.log"
     
     if not log_file.exists():
         pytest.skip("homeassistant.log not found")
     
-    with open(log_file, 'r', encoding='utf-8') as f:
-        log_content = f.read()
-    
-    # Find number platform related errors
-    number_errors = []
-    
-    # Look for ConfigEntryNotReady error
-    config_ready_match = re.search(r'ConfigEntryNotReady.*number', log_content)
-    if config_ready_match:
-        number_errors.append("ConfigEntryNotReady in number platform")
-    
-    # Look for timeout errors during number setup
-    timeout_matches = re.findall(r'(.*timeout.*number.*|.*number.*timeout.*)', log_content, re.IGNORECASE)
-    number_errors.extend(timeout_matches)
-    
-    # Look for number platform setup taking too long
-    setup_warning_match = re.search(r'Setup of number platform xcc is taking over \d+ seconds', log_content)
-    if setup_warning_match:
-        number_errors.append("Number platform setup taking too long")
-    
-    # Check if coordinator has number data
-    coordinator_numbers_match = re.search(r"Final entity distribution:.*'numbers': (\d+)", log_content)
-    coordinator_numbers_count = int(coordinator_numbers_match.group(1)) if coordinator_numbers_match else 0
-    
-    # Check if number entities were actually added
-    added_numbers_match = re.search(r'Added (\d+) XCC number entities', log_content)
-    added_numbers_count = int(added_numbers_match.group(1)) if added_numbers_match else 0
-    
-    print(f"🔍 ERROR ANALYSIS RESULTS:")
-    print(f"  Errors found: {len(number_errors)}")
-    for error in number_errors:
-        print(f"    - {error}")
-    
-    print(f"\n📊 NUMBER ENTITY COUNTS:")
-    print(f"  Coordinator created: {coordinator_numbers_count} number entities")
-    print(f"  Platform added: {added_numbers_count} number entities")
-    print(f"  Missing: {coordinator_numbers_count - added_numbers_count} number entities")
-    
-    print(f"\n🎯 ROOT CAUSE:")
-    if coordinator_numbers_count > 0 and added_numbers_count == 0:
-        print(f"  ❌ Number platform setup failed completely")
-        print(f"  ❌ Coordinator has {coordinator_numbers_count} number entities but none were added")
-        print(f"  ❌ Likely cause: ConfigEntryNotReady due to timeout")
-    elif coordinator_numbers_count > added_numbers_count:
-        print(f"  ⚠️  Partial number platform setup")
-        print(f"  ⚠️  Some number entities missing")
-    else:
-        print(f"  ✅ Number platform setup successful")
-    
-    print(f"\n🔧 SOLUTION:")
-    print(f"  1. Remove blocking async_config_entry_first_refresh() call")
-    print(f"  2. Add timeout protection and error handling")
-    print(f"  3. Make number platform setup non-blocking")
-    print(f"  4. Allow entities to handle missing data gracefully")
+    # Only the tail of a large log is scanned: the entity-distribution and
+    # "Added N" markers are logged at the end of each startup, so the most
+    # recent startup sits near the end. Fall back to the whole file if the
+    # tail is missing either count.
+    size = log_file.stat().st_size
+    start = max(0, size - LOG_TAIL_BYTES)
+    number_errors, coordinator_numbers_count, added_numbers_count = _scan_number_log(log_file, start)
+    if start and (coordinator_numbers_count is None or added_numbers_count is None):
+        number_errors, coordinator_numbers_count, added_numbers_count = _scan_number_log(log_file)
+    coordinator_numbers_count = coordinator_numbers_count or 0
+    added_numbers_count = added_numbers_count or 0
+    
+    _LOGGER.debug("Number platform errors found: %s", number_errors)
+    _LOGGER.debug(
+        "Number entities: coordinator created %d, platform added %d",
+        coordinator_numbers_count,
+        added_numbers_count,
+    )
     
     # Test assertions
     assert coordinator_numbers_count > 50, f"Coordinator should create many number entities, found {coordinator_numbers_count}"
     
     if added_numbers_count == 0 and coordinator_numbers_count > 0:
-        print(f"⚠️  WARNING: Number platform setup failed - this test documents the issue")
         # Don't fail the test, just document the issue
-    
-    print(f"✅ Number platform error analysis completed!")
+        _LOGGER.warning(
+            "Number platform setup failed: coordinator has %d number entities but none were added",
+            coordinator_numbers_count,
+        )
 
 
-def test_expected_number_entities():
+@pytest.fixture
+def number_log(tmp_path):
+    """A small homeassistant.log with two startups, the second one the latest."""
+    log_file = tmp_path / "homeassistant.log"
+    log_file.write_bytes(
+        b"INFO Final entity distribution: {'sensors': 300, 'numbers': 60}\n"
+        b"INFO Added 0 XCC number entities\n"
+        b"WARNING Timeout while setting up number platform\n"
+        b"INFO Final entity distribution: {'sensors': 310, 'numbers': 72}\n"
+        b"INFO Added 72 XCC number entities\n"
+    )
+    return log_file
+
+
+def test_scan_number_log_reports_latest_startup(number_log):
+    """The counts come from the most recent startup in the scanned range."""
+    number_errors, coordinator_numbers, added_numbers = _scan_number_log(number_log)
+
+    assert (coordinator_numbers, added_numbers) == (72, 72)
+    assert number_errors == ["WARNING Timeout while setting up number platform"]
+
+
+def test_scan_number_log_skips_partial_first_line(number_log):
+    """A tail scan starting mid-line ignores that line and sees only later ones."""
+    content = number_log.read_bytes()
+    start = content.index(b"Timeout") + 1
+
+    number_errors, coordinator_numbers, added_numbers = _scan_number_log(number_log, start)
+
+    assert number_errors == []
+    assert (coordinator_numbers, added_numbers) == (72, 72)
+
+
+def test_expected_number_entities(tuv_desc, tuv_data):
     """Test that expected number entities like TUVMINIMALNI should be created."""
     
-    print(f"\n=== TESTING EXPECTED NUMBER ENTITIES ===")
-    
-    # Load TUV descriptor to find number entities
-    sample_dir = project_root / "tests" / "sample_data"
-    tuv_desc_file = sample_dir / "tuv1.xml"
-    tuv_data_file = sample_dir / "TUV11.XML"
-    
-    if not tuv_desc_file.exists() or not tuv_data_file.exists():
-        pytest.skip("TUV sample files not found")
-    
-    # Load files
-    with open(tuv_desc_file, 'r', encoding='utf-8') as f:
-        desc_content = f.read()
-    
-    with open(tuv_data_file, 'r', encoding='utf-8') as f:
-        data_content = f.read()
-    
-    # Find TUVMINIMALNI in descriptor
-    tuvminimalni_desc_match = re.search(r'<number[^>]*prop="TUVMINIMALNI"[^>]*>', desc_content)
-    
-    # Find TUVMINIMALNI in data
-    tuvminimalni_data_match = re.search(r'<INPUT[^>]*P="TUVMINIMALNI"[^>]*VALUE="([^"]*)"', data_content)
-    
-    # Check if it's writable (not readonly)
-    tuvminimalni_readonly = False
-    if tuvminimalni_desc_match:
-        readonly_match = re.search(r'config="[^"]*readonly[^"]*"', tuvminimalni_desc_match.group(0))
-        tuvminimalni_readonly = readonly_match is not None
-    
-    print(f"🔍 TUVMINIMALNI ANALYSIS:")
-    print(f"  In descriptor: {tuvminimalni_desc_match is not None}")
-    print(f"  In data: {tuvminimalni_data_match is not None}")
-    print(f"  Value: {tuvminimalni_data_match.group(1) if tuvminimalni_data_match else 'N/A'}")
-    print(f"  Readonly: {tuvminimalni_readonly}")
-    print(f"  Should be number entity: {tuvminimalni_desc_match is not None and tuvminimalni_data_match is not None and not tuvminimalni_readonly}")
-    
-    # Find other expected number entities
-    expected_number_entities = [
-        "TUVPOZADOVANA", "TUVMINIMALNI", "TUVMAXIMALNIDOBANATAPENI", 
-        "TUVDOBAKLIDU", "TO-POZADOVANA", "TO-UTLUMOVA"
-    ]
+    # One descriptor scan for the candidates' config attributes, one pass over the data values
+    desc_configs = {
+        m.group(1).decode(): m.group(2) or b"" for m in EXPECTED_NUMBER_DESC_RE.finditer(tuv_desc)
+    }
+    data_values = {p.decode(): v.decode("windows-1250") for p, v in INPUT_RE.findall(tuv_data)}
     
-    found_expected = []
+    found_expected = {}
     missing_expected = []
     
-    for entity in expected_number_entities:
-        desc_match = re.search(rf'<number[^>]*prop="{re.escape(entity)}"[^>]*>', desc_content)
-        data_match = re.search(rf'<INPUT[^>]*P="{re.escape(entity)}"[^>]*VALUE="([^"]*)"', data_content)
+    for entity in EXPECTED_NUMBER_ENTITIES:
+        config = desc_configs.get(entity)
+        value = data_values.get(entity)
         
-        if desc_match and data_match:
-            # Check if readonly
-            readonly_match = re.search(r'config="[^"]*readonly[^"]*"', desc_match.group(0))
-            is_readonly = readonly_match is not None
-            
-            if not is_readonly:
-                found_expected.append((entity, data_match.group(1)))
+        if config is not None and value is not None:
+            if b"readonly" not in config:
+                found_expected[entity] = value
             else:
                 missing_expected.append((entity, "readonly"))
         else:
             missing_expected.append((entity, "not found"))
     
-    print(f"\n📊 EXPECTED NUMBER ENTITIES:")
-    print(f"  Found and writable: {len(found_expected)}")
-    for entity, value in found_expected:
-        print(f"    ✅ {entity} = {value}")
-    
-    print(f"  Missing or readonly: {len(missing_expected)}")
-    for entity, reason in missing_expected:
-        print(f"    ❌ {entity} ({reason})")
+    _LOGGER.debug("Expected number entities found and writable: %s", found_expected)
+    _LOGGER.debug("Expected number entities missing or readonly: %s", missing_expected)
     
     # Test assertions
-    assert len(found_expected) > 0, "Should find some expected number entities"
-    
-    # Check specifically for TUVMINIMALNI
-    tuvminimalni_found = any(entity == "TUVMINIMALNI" for entity, _ in found_expected)
-    if tuvminimalni_found:
-        print(f"✅ TUVMINIMALNI should be created as number entity")
-    else:
-        print(f"❌ TUVMINIMALNI will not be created as number entity")
-        # Check why
-        if tuvminimalni_readonly:
-            print(f"   Reason: TUVMINIMALNI is marked as readonly")
-        elif not tuvminimalni_desc_match:
-            print(f"   Reason: TUVMINIMALNI not found in descriptor")
-        elif not tuvminimalni_data_match:
-            print(f"   Reason: TUVMINIMALNI not found in data")
-    
-    print(f"✅ Expected number entities test completed!")
+    assert len(found_expected) > 0, (
+        f"Should find some expected number entities, missing or readonly: {missing_expected}"
+    )
 
 
-def test_number_platform_fix_verification():
+def test_number_platform_fix_verification(number_code):
     """Verify that the number platform fix addresses the timeout issue."""
     
-    print(f"\n=== NUMBER PLATFORM FIX VERIFICATION ===")
-    
-    # Load the updated number platform code
-    number_py_file = project_root / "custom_components" / "xcc" / "number.py"
-    
-    if not number_py_file.exists():
-        pytest.skip("number.py not found")
-    
-    with open(number_py_file, 'r', encoding='utf-8') as f:
-        number_code = f.read()
-    
     # Check for fix patterns
     fix_patterns = {
         "Timeout protection": "try:" in number_code and "except" in number_code,
@@ -300,11 +290,6 @@ def test_number_platform_fix_verification():
         "Data availability check": "coordinator.data" in number_code and "if" in number_code,
     }
     
-    print(f"🔧 FIX VERIFICATION:")
-    for pattern, found in fix_patterns.items():
-        status = "✅ IMPLEMENTED" if found else "❌ MISSING"
-        print(f"  {pattern}: {status}")
-    
     # Check specific improvements
     improvements = {
         "Removed blocking call": "await coordinator.async_config_entry_first_refresh()" not in number_code or "try:" in number_code,
@@ -313,43 +298,13 @@ def test_number_platform_fix_verification():
         "Added logging": "_LOGGER.info" in number_code and "_LOGGER.error" in number_code,
     }
     
-    print(f"\n📈 IMPROVEMENTS:")
-    for improvement, implemented in improvements.items():
-        status = "✅ YES" if implemented else "❌ NO"
-        print(f"  {improvement}: {status}")
-    
     # Test assertions
-    all_fixes_implemented = all(fix_patterns.values())
-    all_improvements_made = all(improvements.values())
+    missing_fixes = [pattern for pattern, found in fix_patterns.items() if not found]
+    missing_improvements = [name for name, made in improvements.items() if not made]
     
-    assert all_fixes_implemented, "All fix patterns should be implemented"
-    assert all_improvements_made, "All improvements should be made"
-    
-    print(f"\n🎯 EXPECTED RESULT:")
-    print(f"  ✅ Number platform should no longer timeout")
-    print(f"  ✅ Number entities should be created successfully")
-    print(f"  ✅ TUVMINIMALNI should appear as number.xcc_tuvminimalni")
-    print(f"  ✅ ~109 number entities should be available in Home Assistant")
-    
-    print(f"✅ Number platform fix verification PASSED!")
+    assert not missing_fixes, f"All fix patterns should be implemented, missing: {missing_fixes}"
+    assert not missing_improvements, f"All improvements should be made, missing: {missing_improvements}"
 
 
 if __name__ == "__main__":
-    """Run tests directly for debugging."""
-    print("🧪 Running Number Platform Setup Tests")
-    print("=" * 60)
-    
-    try:
-        test_number_platform_resilience()
-        test_coordinator_number_data_structure()
-        test_expected_number_entities()
-        test_number_platform_fix_verification()
-        
-        print("\n" + "=" * 60)
-        print("🎉 ALL NUMBER PLATFORM TESTS PASSED!")
-        print("✅ Number platform should now work correctly")
-        print("🔧 TUVMINIMALNI and other number entities should appear after restart")
-        
-    except Exception as e:
-        print(f"\n❌ TEST FAILED: {e}")
-        raise
+    pytest.main([__file__, "-v"])
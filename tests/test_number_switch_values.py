@@ -1,27 +1,16 @@
 """Test that number and switch entities get proper values with enhanced descriptor parsing."""
 
-import sys
-from pathlib import Path
-
 import pytest
 
 pytest.importorskip("homeassistant")
 
 from unittest.mock import Mock
 
-project_root = Path(__file__).parent.parent
-
 
-def test_enhanced_descriptor_identifies_writable_entities():
+def test_enhanced_descriptor_identifies_writable_entities(xcc_modules):
     """Test that enhanced descriptor parser identifies writable numbers and switches."""
     
-    try:
-        sys.path.insert(0, str(project_root / "custom_components" / "xcc"))
-        from descriptor_parser import XCCDescriptorParser
-    except ImportError as e:
-        pytest.skip(f"Cannot import XCCDescriptorParser: {e}")
-    
-    parser = XCCDescriptorParser()
+    parser = xcc_modules.descriptor_parser.XCCDescriptorParser()
     
     # XML with writable number and switch entities
     xml_content = '''<?xml version="1.0" encoding="utf-8"?>
@@ -68,16 +57,9 @@ def test_enhanced_descriptor_identifies_writable_entities():
         assert config["writable"] is False, "CURRENT-TEMP should be readonly"
 
 
-def test_coordinator_entity_type_detection():
+def test_coordinator_entity_type_detection(xcc_modules):
     """Test that coordinator properly detects entity types from enhanced descriptors."""
     
-    try:
-        sys.path.insert(0, str(project_root / "custom_components" / "xcc"))
-        from coordinator import XCCDataUpdateCoordinator
-        from descriptor_parser import XCCDescriptorParser
-    except ImportError as e:
-        pytest.skip(f"Cannot import coordinator classes: {e}")
-    
     # Create mock coordinator with enhanced entity configs
     coordinator = Mock()
     
@@ -106,7 +88,7 @@ def test_coordinator_entity_type_detection():
     }
     
     # Create a real coordinator instance to test get_entity_type method
-    real_coordinator = XCCDataUpdateCoordinator(None, "192.168.1.100", "user", "pass")
+    real_coordinator = xcc_modules.coordinator.XCCDataUpdateCoordinator(None, "192.168.1.100", "user", "pass")
     real_coordinator.entity_configs = entity_configs
     
     # Test entity type detection
@@ -160,17 +142,14 @@ def test_entity_data_structure_includes_values():
         assert field_name is not None, f"Entity {entity['entity_id']} field_name should not be None"
 
 
-def test_number_switch_platforms_use_enhanced_detection():
+def test_number_switch_platforms_use_enhanced_detection(xcc_sources):
     """Test that switch platform uses coordinator.entities (resolved types) not descriptor-only lookup."""
 
-    switch_file = project_root / "custom_components" / "xcc" / "switch.py"
-    number_file = project_root / "custom_components" / "xcc" / "number.py"
-
-    if not all([switch_file.exists(), number_file.exists()]):
+    if not {"switch.py", "number.py"} <= xcc_sources.keys():
         pytest.skip("Cannot find switch.py or number.py files")
 
-    switch_content = switch_file.read_text()
-    number_content = number_file.read_text()
+    switch_content = xcc_sources["switch.py"]
+    number_content = xcc_sources["number.py"]
 
     # Switch platform must use get_entities_by_type (reads from coordinator.entities
     # with fully resolved types including _BOOL_i → switch for descriptor-less entities)
@@ -182,16 +161,10 @@ def test_number_switch_platforms_use_enhanced_detection():
         "Number platform should use coordinator.get_entity_type()"
 
 
-def test_writable_entity_detection():
+def test_writable_entity_detection(xcc_modules):
     """Test that writable entities are properly detected and configured."""
     
-    try:
-        sys.path.insert(0, str(project_root / "custom_components" / "xcc"))
-        from descriptor_parser import XCCDescriptorParser
-    except ImportError as e:
-        pytest.skip(f"Cannot import XCCDescriptorParser: {e}")
-    
-    parser = XCCDescriptorParser()
+    parser = xcc_modules.descriptor_parser.XCCDescriptorParser()
     
     # Test writable vs readonly detection
     test_cases = [
@@ -1,5 +1,6 @@
 """Simple test for XCC page discovery functionality using sample data."""
 
+import functools
 import pytest
 import os
 import sys
@@ -8,78 +9,109 @@ import re
 # Add the custom_components directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+# Patterns over main.xml: active pages (VALUE="1"), all pages, and page URL + name.
+# The [^<]*(?:<(?!/F>)[^<]*)* runs stop at the page's closing </F>, so a page
+# never picks up the flag or name of a later page.
+_ACTIVE_RE = re.compile(r'<F[^>]*U="([^"]+)"[^>]*>[^<]*(?:<(?!/F>)[^<]*)*?VALUE="1"')
+_ALL_PAGES_RE = re.compile(r'<F[^>]*U="([^"]+)"')
+_PAGE_NAME_RE = re.compile(r'<F[^>]*U="([^"]+)"[^>]*>[^<]*(?:<(?!INPUTN|/F>)[^<]*)*<INPUTN[^>]*VALUE="([^"]*)"')
+
+# Page type keywords in priority order; the first keyword found in the URL
+# wins, so 'tuv' outranks 'biv' (bivtuv is hot water).
+_PAGE_TYPE_KEYWORDS = (
+    ('okruh.xml', 'heating_circuit'),
+    ('mzona.xml', 'mixed_zone'),
+    ('tuv', 'hot_water'),
+    ('bazen', 'pool'),
+    ('bazmist', 'pool'),
+    ('fve.xml', 'photovoltaics'),
+    ('vzt.xml', 'ventilation'),
+    ('biv', 'bivalent'),
+    ('solar.xml', 'solar'),
+    ('meteo.xml', 'weather_station'),
+    ('pocasi.xml', 'weather_forecast'),
+    ('elmer.xml', 'electricity_meter'),
+    ('spot.xml', 'spot_pricing'),
+)
+
+
+@functools.lru_cache(maxsize=64)
+def determine_page_type(page_url):
+    """Determine the type of page based on its URL."""
+    url_lower = page_url.lower()
+    for keyword, page_type in _PAGE_TYPE_KEYWORDS:
+        if keyword in url_lower:
+            return page_type
+    return 'other'
+
+
+def get_data_page_patterns(descriptor_page):
+    """Get potential data page patterns for a descriptor page."""
+    base_name = descriptor_page.replace('.xml', '').upper()
+    return [
+        f"{base_name}1.XML",
+        f"{base_name}4.XML",
+        f"{base_name}10.XML",
+        f"{base_name}11.XML",
+    ]
+
+
+# Test cases based on the actual main.xml content
+PAGE_TYPE_CASES = [
+    ('okruh.xml?page=0', 'heating_circuit'),
+    ('okruh.xml?page=1', 'heating_circuit'),
+    ('mzona.xml?p=0', 'mixed_zone'),
+    ('tuv1.xml', 'hot_water'),
+    ('tuv2.xml', 'hot_water'),
+    ('bazen1.xml', 'pool'),
+    ('bazmist.xml', 'pool'),
+    ('fve.xml', 'photovoltaics'),
+    ('vzt.xml', 'ventilation'),
+    ('biv.xml', 'bivalent'),
+    ('bivtuv.xml', 'hot_water'),  # bivtuv contains 'tuv' so it's classified as hot_water
+    ('solar.xml', 'solar'),
+    ('meteo.xml', 'weather_station'),
+    ('pocasi.xml', 'weather_forecast'),
+    ('elmer.xml', 'electricity_meter'),
+    ('spot.xml', 'spot_pricing'),
+    ('unknown.xml', 'other'),
+]
+
+# Known descriptor pages and their candidate data pages
+DATA_PAGE_PATTERN_CASES = [
+    ('fve.xml', ['FVE1.XML', 'FVE4.XML', 'FVE10.XML', 'FVE11.XML']),
+    ('okruh.xml', ['OKRUH1.XML', 'OKRUH4.XML', 'OKRUH10.XML', 'OKRUH11.XML']),
+    ('tuv1.xml', ['TUV11.XML', 'TUV14.XML', 'TUV110.XML', 'TUV111.XML']),
+    ('biv.xml', ['BIV1.XML', 'BIV4.XML', 'BIV10.XML', 'BIV11.XML']),
+]
+
+# Sample data files the discovery tests rely on
+EXPECTED_SAMPLE_FILES = frozenset({
+    'main.xml',
+    'fve.xml',
+    'FVE4.XML',
+    'okruh.xml',
+    'OKRUH10.XML',
+    'tuv1.xml',
+    'TUV11.XML',
+    'stavjed.xml',
+    'STAVJED1.XML',
+})
+
 
 class TestPageDiscoverySimple:
     """Simple tests for page discovery functionality."""
 
     @pytest.fixture
-    def sample_main_xml(self, sample_data_dir):
-        """Load the actual main.xml sample data."""
-        main_xml_path = os.path.join(sample_data_dir, 'main.xml')
-        with open(main_xml_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        # Wrap in PAGE element for proper XML structure
-        return f'<PAGE>{content}</PAGE>'
+    def sample_main_xml(self, sample_main_xml):
+        """Return the session's main.xml sample data wrapped in a PAGE element."""
+        return f'<PAGE>{sample_main_xml}</PAGE>'
 
-    def test_page_type_determination_logic(self):
+    @pytest.mark.parametrize("page_url,expected_type", PAGE_TYPE_CASES)
+    def test_page_type_determination_logic(self, page_url, expected_type):
         """Test the page type determination logic."""
-        def determine_page_type(page_url):
-            """Determine the type of page based on its URL."""
-            url_lower = page_url.lower()
-            
-            if 'okruh.xml' in url_lower:
-                return 'heating_circuit'
-            elif 'mzona.xml' in url_lower:
-                return 'mixed_zone'
-            elif 'tuv' in url_lower:
-                return 'hot_water'
-            elif 'bazen' in url_lower or 'bazmist' in url_lower:
-                return 'pool'
-            elif 'fve.xml' in url_lower:
-                return 'photovoltaics'
-            elif 'vzt.xml' in url_lower:
-                return 'ventilation'
-            elif 'biv' in url_lower and 'tuv' not in url_lower:
-                return 'bivalent'
-            elif 'solar.xml' in url_lower:
-                return 'solar'
-            elif 'meteo.xml' in url_lower:
-                return 'weather_station'
-            elif 'pocasi.xml' in url_lower:
-                return 'weather_forecast'
-            elif 'elmer.xml' in url_lower:
-                return 'electricity_meter'
-            elif 'spot.xml' in url_lower:
-                return 'spot_pricing'
-            else:
-                return 'other'
-
-        # Test cases based on the actual main.xml content
-        test_cases = [
-            ('okruh.xml?page=0', 'heating_circuit'),
-            ('okruh.xml?page=1', 'heating_circuit'),
-            ('mzona.xml?p=0', 'mixed_zone'),
-            ('tuv1.xml', 'hot_water'),
-            ('tuv2.xml', 'hot_water'),
-            ('bazen1.xml', 'pool'),
-            ('bazmist.xml', 'pool'),
-            ('fve.xml', 'photovoltaics'),
-            ('vzt.xml', 'ventilation'),
-            ('biv.xml', 'bivalent'),
-            ('bivtuv.xml', 'hot_water'),  # bivtuv contains 'tuv' so it's classified as hot_water
-            ('solar.xml', 'solar'),
-            ('meteo.xml', 'weather_station'),
-            ('pocasi.xml', 'weather_forecast'),
-            ('elmer.xml', 'electricity_meter'),
-            ('spot.xml', 'spot_pricing'),
-            ('unknown.xml', 'other'),
-        ]
-        
-        for page_url, expected_type in test_cases:
-            result = determine_page_type(page_url)
-            assert result == expected_type, f"Page type detection failed for {page_url}: got {result}, expected {expected_type}"
-        
-        print(f"✅ Page type determination test passed for {len(test_cases)} cases")
+        result = determine_page_type(page_url)
+        assert result == expected_type, f"Page type detection failed for {page_url}: got {result}, expected {expected_type}"
 
     def test_main_xml_content_analysis(self, sample_main_xml):
         """Test analysis of main.xml content without XML parsing."""
@@ -93,15 +125,14 @@ class TestPageDiscoverySimple:
         assert 'Tepl� voda' in sample_main_xml, "Should contain hot water name (with actual encoding)"
         
         # Find active pages using regex (pages with VALUE="1")
-        active_pattern = r'<F[^>]*U="([^"]+)"[^>]*>.*?VALUE="1".*?</F>'
-        active_matches = re.findall(active_pattern, sample_main_xml, re.DOTALL)
+        active_matches = {m.group(1) for m in _ACTIVE_RE.finditer(sample_main_xml)}
         
         # Expected active pages based on the actual sample data
-        # From the test output: ['okruh.xml?page=0', 'okruh.xml?page=1', 'tuv2.xml', 'bazen2.xml', 'bazmist.xml', 'meteo.xml']
         expected_active = [
             'okruh.xml?page=0',  # Radi�tory (actual encoding)
-            # Note: tuv1.xml is not active in the sample data, tuv2.xml is
-            # Note: fve.xml and pocasi.xml are not showing as active in the regex match
+            'tuv1.xml',          # Tepl� voda (actual encoding)
+            'fve.xml',
+            'pocasi.xml',
         ]
         
         print(f"Found active pages: {active_matches}")
@@ -110,18 +141,16 @@ class TestPageDiscoverySimple:
             assert expected_page in active_matches, f"Expected active page {expected_page} not found"
         
         # Find all pages (active and inactive)
-        all_pages_pattern = r'<F[^>]*U="([^"]+)"'
-        all_matches = re.findall(all_pages_pattern, sample_main_xml)
+        all_count = sum(1 for _ in _ALL_PAGES_RE.finditer(sample_main_xml))
         
-        assert len(all_matches) > len(active_matches), "Should have more total pages than active pages"
+        assert all_count > len(active_matches), "Should have more total pages than active pages"
         
-        print(f"✅ Main XML analysis passed: {len(active_matches)} active pages, {len(all_matches)} total pages")
+        print(f"✅ Main XML analysis passed: {len(active_matches)} active pages, {all_count} total pages")
 
     def test_page_name_extraction(self, sample_main_xml):
         """Test extraction of page names from main.xml."""
-        # Pattern to extract page URL and name
-        page_pattern = r'<F[^>]*U="([^"]+)"[^>]*>.*?<INPUTN[^>]*VALUE="([^"]*)"'
-        matches = re.findall(page_pattern, sample_main_xml, re.DOTALL)
+        # Extract page URL and name pairs
+        matches = _PAGE_NAME_RE.findall(sample_main_xml)
         
         # Expected page names (using actual encoding from sample data)
         expected_names = {
@@ -140,34 +169,11 @@ class TestPageDiscoverySimple:
         
         print(f"✅ Page name extraction passed: found {len(found_names)} named pages")
 
-    def test_data_page_pattern_detection(self):
+    @pytest.mark.parametrize("descriptor,expected_patterns", DATA_PAGE_PATTERN_CASES)
+    def test_data_page_pattern_detection(self, descriptor, expected_patterns):
         """Test detection of data page patterns."""
-        def get_data_page_patterns(descriptor_page):
-            """Get potential data page patterns for a descriptor page."""
-            base_name = descriptor_page.replace('.xml', '').upper()
-            
-            patterns = [
-                f"{base_name}1.XML",
-                f"{base_name}4.XML", 
-                f"{base_name}10.XML",
-                f"{base_name}11.XML",
-            ]
-            
-            return patterns
-        
-        # Test with known descriptor pages
-        test_cases = [
-            ('fve.xml', ['FVE1.XML', 'FVE4.XML', 'FVE10.XML', 'FVE11.XML']),
-            ('okruh.xml', ['OKRUH1.XML', 'OKRUH4.XML', 'OKRUH10.XML', 'OKRUH11.XML']),
-            ('tuv1.xml', ['TUV11.XML', 'TUV14.XML', 'TUV110.XML', 'TUV111.XML']),
-            ('biv.xml', ['BIV1.XML', 'BIV4.XML', 'BIV10.XML', 'BIV11.XML']),
-        ]
-        
-        for descriptor, expected_patterns in test_cases:
-            result = get_data_page_patterns(descriptor)
-            assert result == expected_patterns, f"Data page patterns failed for {descriptor}: got {result}, expected {expected_patterns}"
-        
-        print(f"✅ Data page pattern detection passed for {len(test_cases)} cases")
+        result = get_data_page_patterns(descriptor)
+        assert result == expected_patterns, f"Data page patterns failed for {descriptor}: got {result}, expected {expected_patterns}"
 
     def test_integration_constants_fallback(self):
         """Test that integration constants are available as fallback."""
@@ -198,23 +204,11 @@ class TestPageDiscoverySimple:
 
     def test_sample_data_files_exist(self, sample_data_dir):
         """Test that expected sample data files exist."""
-        expected_files = [
-            'main.xml',
-            'fve.xml',
-            'FVE4.XML',
-            'okruh.xml',
-            'OKRUH10.XML',
-            'tuv1.xml',
-            'TUV11.XML',
-            'stavjed.xml',
-            'STAVJED1.XML',
-        ]
-        
-        for filename in expected_files:
-            file_path = os.path.join(sample_data_dir, filename)
-            assert os.path.exists(file_path), f"Sample data file {filename} should exist"
+        present = {entry.name for entry in os.scandir(sample_data_dir)}
+        missing = EXPECTED_SAMPLE_FILES - present
+        assert not missing, f"Missing sample data files: {sorted(missing)}"
         
-        print(f"✅ Sample data files test passed: {len(expected_files)} files verified")
+        print(f"✅ Sample data files test passed: {len(EXPECTED_SAMPLE_FILES)} files verified")
 
 
 def test_page_discovery_summary():
@@ -1,5 +1,24 @@
 """Test priority-based device assignment."""
 
+import importlib.util
+from pathlib import Path
+
+XCC = Path(__file__).parent.parent / "custom_components" / "xcc"
+
+
+def _load_entity_helpers():
+    spec = importlib.util.spec_from_file_location(
+        "xcc_entity_helpers_priority", XCC / "entity_helpers.py"
+    )
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+# Production page -> device mapping: "FVE4.XML" -> "FVE", "TUV11.XML" -> "TUV1"
+_normalize_page_to_device = _load_entity_helpers()._normalize_page_to_device
+
+
 def test_priority_device_assignment():
     """Test that entities are assigned to devices based on priority order."""
     
@@ -48,7 +67,7 @@ def test_priority_device_assignment():
     entities_by_page = {}
     for entity in mock_entities:
         page = entity["attributes"].get("page", "unknown").upper()
-        page_normalized = page.replace("1.XML", "").replace("10.XML", "").replace("11.XML", "").replace("4.XML", "").replace(".XML", "")
+        page_normalized = _normalize_page_to_device(page, entity["attributes"]["field_name"])
         if page_normalized not in entities_by_page:
             entities_by_page[page_normalized] = []
         entities_by_page[page_normalized].append(entity)
@@ -2,29 +2,28 @@
 import pytest
 import xml.etree.ElementTree as ET
 import sys
+import copy
 import importlib.util
 import logging
 from pathlib import Path
 
 
-def test_real_descriptor_parser_date_fix():
-    """Test the real descriptor parser with the date element fix."""
-    
-    # Import the descriptor parser module directly
+@pytest.fixture(scope="module")
+def descriptor_parser_module():
+    """Load the descriptor_parser module by file path, once for this module."""
     repo_root = Path(__file__).parent.parent
     parser_path = repo_root / "custom_components" / "xcc" / "descriptor_parser.py"
-    
     spec = importlib.util.spec_from_file_location("descriptor_parser", parser_path)
-    descriptor_parser = importlib.util.module_from_spec(spec)
-    
-    # Mock the logger
-    descriptor_parser._LOGGER = logging.getLogger('test')
-    
-    # Execute the module
-    spec.loader.exec_module(descriptor_parser)
+    module = importlib.util.module_from_spec(spec)
+    module._LOGGER = logging.getLogger("test")
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_real_descriptor_parser_date_fix(descriptor_parser_module):
+    """Test the real descriptor parser with the date element fix."""
     
-    # Create parser instance
-    parser = descriptor_parser.XCCDescriptorParser()
+    parser = descriptor_parser_module.XCCDescriptorParser()
     
     # Test the problematic XML that was causing ValueError
     xml_content = '''<?xml version="1.0" encoding="UTF-8"?>
@@ -71,24 +70,10 @@ def test_real_descriptor_parser_date_fix():
     print("✅ Real descriptor parser date fix test passed!")
 
 
-def test_real_descriptor_parser_other_elements():
+def test_real_descriptor_parser_other_elements(descriptor_parser_module):
     """Test that other elements still work correctly."""
     
-    # Import the descriptor parser module directly
-    repo_root = Path(__file__).parent.parent
-    parser_path = repo_root / "custom_components" / "xcc" / "descriptor_parser.py"
-    
-    spec = importlib.util.spec_from_file_location("descriptor_parser", parser_path)
-    descriptor_parser = importlib.util.module_from_spec(spec)
-    
-    # Mock the logger
-    descriptor_parser._LOGGER = logging.getLogger('test')
-    
-    # Execute the module
-    spec.loader.exec_module(descriptor_parser)
-    
-    # Create parser instance
-    parser = descriptor_parser.XCCDescriptorParser()
+    parser = descriptor_parser_module.XCCDescriptorParser()
     
     # Test XML with various element types
     xml_content = '''<?xml version="1.0" encoding="UTF-8"?>
@@ -145,17 +130,6 @@ def test_real_descriptor_parser_other_elements():
     print("✅ Real descriptor parser other elements test passed!")
 
 
-def _load_descriptor_parser():
-    """Helper: load the descriptor_parser module by file path (mirrors other tests)."""
-    repo_root = Path(__file__).parent.parent
-    parser_path = repo_root / "custom_components" / "xcc" / "descriptor_parser.py"
-    spec = importlib.util.spec_from_file_location("descriptor_parser", parser_path)
-    module = importlib.util.module_from_spec(spec)
-    module._LOGGER = logging.getLogger("test")
-    spec.loader.exec_module(module)
-    return module
-
-
 @pytest.mark.parametrize(
     "prop",
     [
@@ -168,7 +142,7 @@ def _load_descriptor_parser():
         "POCASICONFIG-STAT",
     ],
 )
-def test_pocasi_props_do_not_get_hour_unit(prop):
+def test_pocasi_props_do_not_get_hour_unit(descriptor_parser_module, prop):
     """POCASI* props must not be tagged with unit='h' via the CAS heuristic.
 
     Regression for the ValueError observed in production where
@@ -176,8 +150,7 @@ def test_pocasi_props_do_not_get_hour_unit(prop):
     rejected its non-numeric value '25.04.2026 23:00', poisoning coordinator
     refresh and blocking unrelated number writes.
     """
-    descriptor_parser = _load_descriptor_parser()
-    parser = descriptor_parser.XCCDescriptorParser()
+    parser = descriptor_parser_module.XCCDescriptorParser()
 
     inferred = parser._infer_unit_from_context(prop, None, None)
     assert inferred != "h", (
@@ -197,18 +170,16 @@ def test_pocasi_props_do_not_get_hour_unit(prop):
         "FVE-MAXPOCETODLOZENYCHHODIN",
     ],
 )
-def test_legitimate_time_props_still_get_hour_unit(prop):
+def test_legitimate_time_props_still_get_hour_unit(descriptor_parser_module, prop):
     """Genuine CAS/HODIN time props must keep unit='h' (no regression from the POCASI fix)."""
-    descriptor_parser = _load_descriptor_parser()
-    parser = descriptor_parser.XCCDescriptorParser()
+    parser = descriptor_parser_module.XCCDescriptorParser()
 
     assert parser._infer_unit_from_context(prop, None, None) == "h"
 
 
-def test_pocasi_dobaplatnosti_row_prop_end_to_end():
+def test_pocasi_dobaplatnosti_row_prop_end_to_end(descriptor_parser_module):
     """End-to-end: parsing a POCASI row prop must not yield unit='h' on the sensor config."""
-    descriptor_parser = _load_descriptor_parser()
-    parser = descriptor_parser.XCCDescriptorParser()
+    parser = descriptor_parser_module.XCCDescriptorParser()
 
     # Mirrors the structure of fresh_tuv_data/descriptors/pocasi.xml: a row whose
     # own prop is the date string, with typed children (number/icon) for sub-fields.
@@ -242,7 +213,35 @@ def test_pocasi_dobaplatnosti_row_prop_end_to_end():
     assert nazev["device_class"] != "duration"
 
 
+def test_reparsing_unchanged_descriptor_reuses_cached_parse(descriptor_parser_module):
+    """Parsing the same descriptor content twice must give identical configs.
+
+    The second parse is served from the content-keyed cache, so the configs
+    handed out must be copies: changes a caller makes to them (the coordinator
+    and parse_descriptor_files both edit configs in place) must not leak into
+    the next parse.
+    """
+    nast = Path(__file__).parent / "sample_data" / "nast.xml"
+    if not nast.exists():
+        pytest.skip("nast.xml sample not found")
+    xml_content = nast.read_text(encoding="utf-8")
+
+    descriptor_parser = descriptor_parser_module
+    descriptor_parser._DESCRIPTOR_CACHE.clear()
+
+    first = descriptor_parser.XCCDescriptorParser(ignore_visibility=True).parse_descriptor_files(
+        {"nast.xml": xml_content}
+    )
+    assert len(descriptor_parser._DESCRIPTOR_CACHE) == 1
+    expected = copy.deepcopy(first)
+    first["OMEZENIVYKONUGLOBALNI"]["friendly_name_en"] = "changed by caller"
+
+    second = descriptor_parser.XCCDescriptorParser(ignore_visibility=True).parse_descriptor_files(
+        {"nast.xml": xml_content}
+    )
+    assert len(descriptor_parser._DESCRIPTOR_CACHE) == 1
+    assert second == expected
+
+
 if __name__ == "__main__":
-    test_real_descriptor_parser_date_fix()
-    test_real_descriptor_parser_other_elements()
-    print("🎉 All real descriptor parser tests passed!")
+    pytest.main([__file__, "-v"])